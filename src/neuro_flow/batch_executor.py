@@ -361,6 +361,7 @@ class RetryReadNeuroClient(RetryConfig):
     def __init__(self, client: Client) -> None:
         super().__init__()
         self._client = client
+        self._remote_images: Dict[str, RemoteImage] = {}
 
     async def job_start(
         self,
@@ -436,7 +437,13 @@ class RetryReadNeuroClient(RetryConfig):
         return await self._client.images.tag_info(remote_image)
 
     def parse_remote_image(self, image: str) -> RemoteImage:
-        return self._client.parse.remote_image(image)
+        # Tasks of a bake usually share a few images,
+        # RemoteImage is frozen and safe to reuse.
+        ret = self._remote_images.get(image)
+        if ret is None:
+            ret = self._client.parse.remote_image(image)
+            self._remote_images[image] = ret
+        return ret
 
     @property
     def config_presets(self) -> Mapping[str, Preset]:
@@ -3,7 +3,7 @@ import dataclasses
 import click
 import datetime
 import neuro_extras
-from collections import defaultdict
+from collections import defaultdict, deque
 from graphviz import Digraph
 from neuro_cli import __version__ as cli_version
 from neuro_sdk import Client, ResourceNotFound, __version__ as sdk_version
@@ -17,6 +17,7 @@ from typing import (
     AbstractSet,
     AsyncContextManager,
     AsyncIterator,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -90,9 +91,9 @@ class BakeFailedError(Exception):
 
 
 async def iter_flows(top_flow: EarlyBatch) -> AsyncIterator[Tuple[FullID, EarlyBatch]]:
-    to_check: List[Tuple[FullID, EarlyBatch]] = [((), top_flow)]
+    to_check: Deque[Tuple[FullID, EarlyBatch]] = deque([((), top_flow)])
     while to_check:
-        prefix, flow = to_check.pop(0)
+        prefix, flow = to_check.popleft()
         yield prefix, flow
         for tid in flow.graph:
             if await flow.is_action(tid):
@@ -118,9 +119,13 @@ async def check_local_deps(top_flow: EarlyBatch) -> None:
     # with Trie (prefix tree) to reduce time complexity to O(kn^2)
     # (for each task (n) for each task's dependency (n) do Trie check (k))
 
+    # get_action_early() builds a fresh sub-flow on every call,
+    # walk the actions tree once and reuse it for both passes
+    flows = [item async for item in iter_flows(top_flow)]
+
     runs_on_remote: Set[FullID] = set()
 
-    async for prefix, flow in iter_flows(top_flow):
+    for prefix, flow in flows:
         runs_on_remote.update(
             {prefix + (tid,) for tid in flow.graph if await flow.is_task(tid)}
         )
@@ -138,7 +143,7 @@ async def check_local_deps(top_flow: EarlyBatch) -> None:
             if _is_prefix(remote, prefix + (dep,))
         )
 
-    async for prefix, flow in iter_flows(top_flow):
+    for prefix, flow in flows:
         early_locals = cast(
             AsyncIterator[EarlyLocalCall],
             (
@@ -211,6 +216,8 @@ async def check_image_refs_unique(top_flow: RunningBatchFlow) -> None:
 
     errors = []
     for ref, images in _tmp.items():
+        if len(images) == 1:
+            continue
         contexts_differ = len({it.context for it in images}) > 1
         dockerfiles_differ = len({it.dockerfile for it in images}) > 1
         if contexts_differ or dockerfiles_differ:
@@ -225,8 +232,10 @@ async def build_graphs(
     graphs = {}
 
     async for prefix, flow in iter_flows(top_flow):
+        # Build every full id once, dependencies share the key tuples
+        full_ids = {key: prefix + (key,) for key in flow.graph}
         graphs[prefix] = {
-            prefix + (key,): {prefix + (node,) for node in nodes}
+            full_ids[key]: {full_ids[node] for node in nodes}
             for key, nodes in flow.graph.items()
         }
 
@@ -64,10 +64,11 @@ def argument(*param_decls: Any, **attrs: Any) -> Callable[..., Any]:
 
 
 BAKE_ID_PATTERN = r"bake-[0-9a-z]{8}-[0-9a-z]{4}-[0-9a-z]{4}-[0-9a-z]{4}-[0-9a-z]{12}"
+BAKE_ID_RE = re.compile(BAKE_ID_PATTERN)
 
 
 async def resolve_bake(id_or_name: str, *, project: str, storage: Storage) -> str:
-    if re.fullmatch(BAKE_ID_PATTERN, id_or_name):
+    if BAKE_ID_RE.fullmatch(id_or_name):
         return id_or_name
     try:
         bake = await storage.project(yaml_id=project).bake(name=id_or_name).get()
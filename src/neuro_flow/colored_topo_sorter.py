@@ -1,5 +1,15 @@
 from collections import defaultdict
-from typing import AbstractSet, Dict, Generic, Mapping, Set, TypeVar
+from typing import (
+    AbstractSet,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 
 _K = TypeVar("_K")
@@ -28,22 +38,30 @@ class ColoredTopoSorter(Generic[_K, _T]):
         self._check_cycle()
 
     def _check_cycle(self) -> None:
-        seen = set()
-        stack = []
+        # Iterative DFS, nodes on the current path are in progress,
+        # reaching such node again means a back edge, i.e. a cycle
+        done: Set[_K] = set()
+        in_progress: Set[_K] = set()
         for start_node in self._graph:
-            if start_node in seen:
+            if start_node in done:
                 continue
-            stack.append(start_node)
-            seen_step = set()
+            in_progress.add(start_node)
+            stack: List[Tuple[_K, Iterator[_K]]] = [
+                (start_node, iter(self._graph[start_node]))
+            ]
             while stack:
-                node = stack.pop()
-                if node in seen:
-                    continue
-                if node in seen_step:
-                    raise CycleError()
-                seen_step.add(node)
-                stack.extend(self._graph[node])
-            seen.update(seen_step)
+                node, deps = stack[-1]
+                for dep in deps:
+                    if dep in in_progress:
+                        raise CycleError()
+                    if dep not in done:
+                        in_progress.add(dep)
+                        stack.append((dep, iter(self._graph[dep])))
+                        break
+                else:
+                    stack.pop()
+                    in_progress.remove(node)
+                    done.add(node)
 
     def is_colored(self, node: _K, color: _T) -> bool:
         return node in self._color2nodes[color]
@@ -16,7 +16,9 @@ from neuro_flow.parser import (
     ConfigDir,
     make_default_project,
     parse_action_stream,
+    parse_batch,
     parse_batch_stream,
+    parse_live,
     parse_live_stream,
     parse_project_stream,
 )
@@ -298,13 +300,21 @@ class LocalCL(StreamCL, abc.ABC):
 
 
 class LiveLocalCL(LocalCL, LiveStreamCL):
-    pass
+    async def _fetch_flow(self, name: str) -> ast.LiveFlow:
+        # Parse the file directly to share the parsed flow
+        # between loaders while the file is not changed.
+        return parse_live(self.workspace, self.flow_path(name))
 
 
 class BatchLocalCL(
     LocalCL,
     BatchStreamCL,
 ):
+    async def _fetch_flow(self, name: str) -> ast.BatchFlow:
+        # Parse the file directly to share the parsed flow
+        # between loaders while the file is not changed.
+        return parse_batch(self.workspace, self.flow_path(name))
+
     async def collect_configs(
         self, name: str, bake_storage: BakeStorage
     ) -> ConfigsMeta:
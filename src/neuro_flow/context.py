@@ -725,6 +725,9 @@ class LocalActionContext(Context):
     inputs: InputsCtx
 
 
+SLASHES_RE = re.compile(r"//+")
+
+
 def sanitize_name(name: str) -> str:
     # replace non-printable characters with "_"
     if not name.isprintable():
@@ -732,7 +735,7 @@ def sanitize_name(name: str) -> str:
     # ":" is special in role name, replace it with "_"
     name = name.replace(":", "_")
     name = name.replace(" ", "_")  # replace space for readability
-    name = re.sub(r"//+", "/", name)  # collapse repeated "/"
+    name = SLASHES_RE.sub("/", name)  # collapse repeated "/"
     name = name.strip("/")  # remove initial and and trailing "/"
     name = name or "_"  # name should be non-empty
     return name
@@ -1350,10 +1353,11 @@ class RunningLiveFlow:
         self._cl = config_loader
         self._defaults = defaults
         self._mixins = mixins
+        self._job_ids = tuple(sorted(ast_flow.jobs))
 
     @property
     def job_ids(self) -> Iterable[str]:
-        return sorted(self._ast_flow.jobs)
+        return self._job_ids
 
     @property
     def project(self) -> ProjectCtx:
@@ -1158,28 +1158,34 @@ class Expr(BaseExpr[_T]):
                 # explicit non-string value is passed
                 self._try_convert(pattern, start, end)
                 return
-            tokens = list(tokenize(pattern, start=start))
-            if tokens:
-                self._parsed = PARSER.parse(tokens)
-                if (
-                    not self.allow_implicit_concat
-                    and self._parsed
-                    and len(self._parsed) > 1
-                ):
-                    raise EvalError(
-                        "Implicit concatenation is not allowed for "
-                        f"{self.type_name}",
-                        start,
-                        end,
-                    )
+            if pattern and "${{" not in pattern and "$[[" not in pattern:
+                # Plain text is tokenized to a single TEXT token,
+                # skip the tokenizer and the grammar for it.
+                token = tokenize.make_token("TEXT", pattern, start)
+                self._parsed = [make_text(token)]
             else:
-                if not self.allow_implicit_concat:
-                    raise EvalError(
-                        f"Empty value is not allowed for {self.type_name}",
-                        start,
-                        end,
-                    )
-                self._parsed = [Text(start, end, "")]
+                tokens = list(tokenize(pattern, start=start))
+                if tokens:
+                    self._parsed = PARSER.parse(tokens)
+                    if (
+                        not self.allow_implicit_concat
+                        and self._parsed
+                        and len(self._parsed) > 1
+                    ):
+                        raise EvalError(
+                            "Implicit concatenation is not allowed for "
+                            f"{self.type_name}",
+                            start,
+                            end,
+                        )
+                else:
+                    if not self.allow_implicit_concat:
+                        raise EvalError(
+                            f"Empty value is not allowed for {self.type_name}",
+                            start,
+                            end,
+                        )
+                    self._parsed = [Text(start, end, "")]
             assert self._parsed
             if len(self._parsed) == 1 and type(self._parsed[0]) == Text:
                 self._try_convert(self._parsed[0].arg, start, end)
@@ -1445,23 +1451,24 @@ class OptFloatExpr(FloatExprMixin, Expr[float]):
 
 class OptTimeDeltaExpr(OptFloatExpr):
     type_name: ClassVar[str] = "timedelta"
-    RE = re.compile(r"^((?P<d>\d+)d)?((?P<h>\d+)h)?((?P<m>\d+)m)?((?P<s>\d+)s)?$")
+    RE = re.compile(r"^(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$")
 
     def convert(self, arg: TypeT) -> float:
-        try:
-            return super().convert(arg)
-        except (ValueError, SyntaxError):
-            assert isinstance(arg, str)
-            match = self.RE.match(arg)
-            if match is None:
+        # Check the unit form first, a failed float() conversion
+        # costs an exception for every "1d2h"-like value.
+        match = self.RE.match(arg) if isinstance(arg, str) else None
+        if match is None:
+            try:
+                return super().convert(arg)
+            except (ValueError, SyntaxError):
                 raise ValueError(f"{arg!r} is not a time delta unit")
-            td = datetime.timedelta(
-                days=int(match.group("d") or 0),
-                hours=int(match.group("h") or 0),
-                minutes=int(match.group("m") or 0),
-                seconds=int(match.group("s") or 0),
-            )
-            return td.total_seconds()
+        days, hours, minutes, seconds = match.groups()
+        return float(
+            int(days or 0) * 86400
+            + int(hours or 0) * 3600
+            + int(minutes or 0) * 60
+            + int(seconds or 0)
+        )
 
 
 class LocalPathMixin:
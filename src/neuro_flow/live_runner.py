@@ -3,6 +3,7 @@ import dataclasses
 import asyncio
 import click
 import datetime
+import re
 import secrets
 import shlex
 import sys
@@ -18,12 +19,14 @@ from neuro_sdk import (
 )
 from rich import box
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 from types import TracebackType
 from typing import (
     AbstractSet,
     AsyncContextManager,
     AsyncIterator,
+    Dict,
     Iterable,
     List,
     Mapping,
@@ -49,16 +52,34 @@ from .utils import (
 )
 
 
+DASHES_RE = re.compile(r"-{2,}")
+
+# Finished jobs older than this are not looked up
+JOBS_HISTORY_PERIOD = datetime.timedelta(days=7)
+
+
+def tags2dict(tags: Iterable[str]) -> Dict[str, str]:
+    # Split "key:value" job tags, tags without a colon are skipped
+    ret = {}
+    for tag in tags:
+        key, sep, val = tag.partition(":")
+        if sep:
+            ret[key] = val
+    return ret
+
+
 @dataclasses.dataclass(frozen=True)
 class JobInfo:
     id: str
     status: JobStatus
     raw_id: Optional[str]  # low-level job id, None for never runned jobs
-    tags: Iterable[str]
+    tags: Tuple[str, ...]
     when: Optional[datetime.datetime]
 
 
 class LiveRunner(AsyncContextManager["LiveRunner"]):
+    KILL_ALL_CONCURRENCY = 16
+
     def __init__(
         self,
         config_dir: ConfigDir,
@@ -76,11 +97,13 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         self._storage = storage
         self._project_storage: Optional[ProjectStorage] = None
         self._is_projet_role_created = False
+        self._project_role_lock = asyncio.Lock()
         self._run_neuro_cli = make_cmd_exec(
             "neuro", global_options=encode_global_options(global_options)
         )
         self._run_extras_cli = make_cmd_exec("neuro-extras")
         self._dry_run = dry_run
+        self._metas: Dict[str, JobMeta] = {}
 
     async def init_flow(self) -> None:
         if self._flow is not None:
@@ -132,11 +155,20 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         assert self._client is not None
         return self._client
 
+    async def _get_meta(self, job_id: str) -> JobMeta:
+        # A command often needs the meta of the same job several times,
+        # the flow does not change during the runner lifetime.
+        meta = self._metas.get(job_id)
+        if meta is None:
+            meta = await self.flow.get_meta(job_id)
+            self._metas[job_id] = meta
+        return meta
+
     async def _ensure_meta(
         self, job_id: str, suffix: Optional[str], *, skip_check: bool = False
     ) -> JobMeta:
         try:
-            meta = await self.flow.get_meta(job_id)
+            meta = await self._get_meta(job_id)
             if meta.multi:
                 if suffix is None:
                     if not skip_check:
@@ -156,95 +188,118 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             self._console.print(f"[dim]Existing jobs: {jobs_str}")
             sys.exit(1)
 
+    async def _list_jobs(
+        self,
+        tags: Iterable[str],
+        *,
+        statuses: Iterable[JobStatus],
+        reverse: bool = False,
+        limit: Optional[int] = None,
+        since: Optional[datetime.datetime] = None,
+    ) -> List[JobDescription]:
+        return [
+            job
+            async for job in self.client.jobs.list(
+                tags=tags,
+                statuses=statuses,
+                reverse=reverse,
+                limit=limit,
+                since=since,
+            )
+        ]
+
     async def _resolve_jobs(
-        self, meta: JobMeta, suffix: Optional[str]
+        self,
+        meta: JobMeta,
+        suffix: Optional[str],
+        *,
+        since: Optional[datetime.datetime] = None,
     ) -> AsyncIterator[JobDescription]:
-        found = False
-        since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
-            days=7
-        )
+        if since is None:
+            since = datetime.datetime.now(datetime.timezone.utc) - JOBS_HISTORY_PERIOD
+        # Alive and recently finished jobs are fetched by concurrent queries,
+        # alive ones are reported first.
         if meta.multi and not suffix:
-            async for job in self.client.jobs.list(
-                tags=meta.tags,
-                reverse=True,
-                statuses=(JobStatus.PENDING, JobStatus.RUNNING),
-            ):
-                found = True
-                yield job
-            async for job in self.client.jobs.list(
-                tags=meta.tags,
-                reverse=True,
-                statuses=(
-                    JobStatus.SUSPENDED,
-                    JobStatus.SUCCEEDED,
-                    JobStatus.FAILED,
-                    JobStatus.CANCELLED,
+            running, terminated = await asyncio.gather(
+                self._list_jobs(
+                    meta.tags,
+                    reverse=True,
+                    statuses=(JobStatus.PENDING, JobStatus.RUNNING),
                 ),
-                since=since,
-            ):
-                found = True
-                yield job
+                self._list_jobs(
+                    meta.tags,
+                    reverse=True,
+                    statuses=(
+                        JobStatus.SUSPENDED,
+                        JobStatus.SUCCEEDED,
+                        JobStatus.FAILED,
+                        JobStatus.CANCELLED,
+                    ),
+                    since=since,
+                ),
+            )
+            jobs = running + terminated
         else:
             tags = list(meta.tags)
             if meta.multi and suffix:
                 tags.append(f"multi:{suffix}")
-            async for job in self.client.jobs.list(
-                tags=tags,
-                reverse=True,
-                limit=1,
-                statuses=(JobStatus.PENDING, JobStatus.RUNNING),
-            ):
-                found = True
-                yield job
-                return
-            async for job in self.client.jobs.list(
-                tags=tags,
-                reverse=True,
-                limit=1,
-                statuses=(
-                    JobStatus.SUSPENDED,
-                    JobStatus.SUCCEEDED,
-                    JobStatus.FAILED,
-                    JobStatus.CANCELLED,
+            running, terminated = await asyncio.gather(
+                self._list_jobs(
+                    tags,
+                    reverse=True,
+                    limit=1,
+                    statuses=(JobStatus.PENDING, JobStatus.RUNNING),
                 ),
-                since=since,
-            ):
-                found = True
-                yield job
-                return
-        if not found:
+                self._list_jobs(
+                    tags,
+                    reverse=True,
+                    limit=1,
+                    statuses=(
+                        JobStatus.SUSPENDED,
+                        JobStatus.SUCCEEDED,
+                        JobStatus.FAILED,
+                        JobStatus.CANCELLED,
+                    ),
+                    since=since,
+                ),
+            )
+            jobs = running or terminated
+        if not jobs:
             raise ResourceNotFound
+        for job in jobs:
+            yield job
 
-    async def _job_status(self, job_id: str) -> List[JobInfo]:
+    async def _job_status(
+        self, job_id: str, *, since: Optional[datetime.datetime] = None
+    ) -> List[JobInfo]:
         meta = await self._ensure_meta(job_id, None, skip_check=True)
         ret = []
         found_suffixes = set()
         try:
-            async for descr in self._resolve_jobs(meta, None):
+            async for descr in self._resolve_jobs(meta, None, since=since):
                 if descr.status == JobStatus.PENDING:
                     when = descr.history.created_at
                 elif descr.status == JobStatus.RUNNING:
                     when = descr.history.started_at
                 else:
                     when = descr.history.finished_at
-                real_id: Optional[str] = None
-                for tag in descr.tags:
-                    key, sep, val = tag.partition(":")
-                    if sep and key == "multi":
-                        if val in found_suffixes:
-                            break
-                        else:
-                            found_suffixes.add(val)
-                        real_id = f"{job_id} {val}"
-                        break
-                else:
+                real_id: Optional[str]
+                suffix = tags2dict(descr.tags).get("multi")
+                if suffix is None:
                     real_id = job_id
+                elif suffix in found_suffixes:
+                    real_id = None
+                else:
+                    found_suffixes.add(suffix)
+                    real_id = f"{job_id} {suffix}"
                 if real_id is not None:
                     ret.append(
-                        JobInfo(real_id, descr.status, descr.id, descr.tags, when)
+                        JobInfo(
+                            real_id, descr.status, descr.id, tuple(descr.tags), when
+                        )
                     )
         except ResourceNotFound:
-            ret.append(JobInfo(job_id, JobStatus.UNKNOWN, None, meta.tags, None))
+            ret.append(JobInfo(job_id, JobStatus.UNKNOWN, None, tuple(meta.tags), None))
         return ret
 
     async def list_suffixes(self, job_id: str) -> AbstractSet[str]:
@@ -252,10 +307,9 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         result = set()
         try:
             async for job in self._resolve_jobs(meta, None):
-                for tag in job.tags:
-                    key, sep, val = tag.partition(":")
-                    if sep and key == "multi":
-                        result.add(val)
+                suffix = tags2dict(job.tags).get("multi")
+                if suffix is not None:
+                    result.add(suffix)
         except ResourceNotFound:
             pass
         return result
@@ -263,28 +317,29 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
     async def ps(self) -> None:
         """Return statuses for all jobs from the flow"""
 
-        # TODO: make concurent queries for job statuses
-        loop = asyncio.get_event_loop()
         table = Table(box=box.MINIMAL_HEAVY_HEAD)
         table.add_column("JOB", style="bold")
         table.add_column("STATUS")
         table.add_column("RAW ID", style="bright_black")
         table.add_column("WHEN")
 
-        tasks = []
-        for job_id in self.flow.job_ids:
-            tasks.append(loop.create_task(self._job_status(job_id)))
-
-        for bulk in await asyncio.gather(*tasks):
-            for info in bulk:
-                table.add_row(
-                    info.id,
-                    TaskStatus(info.status),
-                    info.raw_id or "N/A",
-                    fmt_datetime(info.when),
-                )
-
-        self._console.print(table)
+        # All jobs are reported for the same period
+        since = datetime.datetime.now(datetime.timezone.utc) - JOBS_HISTORY_PERIOD
+        tasks = [
+            asyncio.create_task(self._job_status(job_id, since=since))
+            for job_id in self.flow.job_ids
+        ]
+
+        # Show rows as soon as they are known, keeping the job ids order
+        with Live(table, console=self._console, refresh_per_second=4):
+            for task in tasks:
+                for info in await task:
+                    table.add_row(
+                        info.id,
+                        TaskStatus(info.status),
+                        info.raw_id or "N/A",
+                        fmt_datetime(info.when),
+                    )
 
     async def status(self, job_id: str, suffix: Optional[str]) -> None:
         meta_ctx = await self._ensure_meta(job_id, suffix)
@@ -302,23 +357,21 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         args: Optional[Tuple[str]],
         params: Mapping[str, str],
     ) -> bool:
-        is_multi = await self.flow.is_multi(job_id)
+        is_multi = (await self._get_meta(job_id)).multi
 
         if not is_multi or suffix:
             meta = await self._ensure_meta(job_id, suffix)
             try:
-                jobs = []
-                async for descr in self._resolve_jobs(meta, suffix):
-                    jobs.append(descr)
-                if len(jobs) > 1:
+                # Not a multi job or a multi job with suffix,
+                # the lookup yields a single job only
+                jobs = self._resolve_jobs(meta, suffix)
+                descr = await jobs.__anext__()
+                async for extra in jobs:
                     # Should never happen, but just in case
                     raise click.ClickException(
                         f"Found multiple running jobs for id {job_id} and"
-                        f" suffix {suffix}:\n"
-                        "\n".join(job.id for job in jobs)
+                        f" suffix {suffix}:\n{descr.id}\n{extra.id}"
                     )
-                assert len(jobs) == 1
-                descr = jobs[0]
                 if is_multi and args:
                     raise click.ClickException(
                         "Multi job with such suffix is already running."
@@ -386,19 +439,16 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             name = job.name
         else:
             first_part = self._flow.project.id.replace("_", "-").strip("-")
-            while "--" in first_part:
-                first_part = first_part.replace("--", "-")
+            first_part = DASHES_RE.sub("-", first_part)
             second_part = job_id
             if is_multi:
                 second_part += f"-{suffix}"
             second_part = second_part.replace("_", "-").strip("-")
-            while "--" in second_part:
-                second_part = second_part.replace("--", "-")
+            second_part = DASHES_RE.sub("-", second_part)
 
             first_part = first_part[: 40 - len(second_part) - 1]
             name = first_part + "-" + second_part
-            while "--" in name:
-                name = name.replace("--", "-")
+            name = DASHES_RE.sub("-", name)
         run_args.append(f"--name={name}")
         if job.preset is not None:
             run_args.append(f"--preset={job.preset}")
@@ -415,20 +465,16 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             run_args.append(f"--entrypoint={job.entrypoint}")
         if job.workdir is not None:
             run_args.append(f"--workdir={job.workdir}")
-        for k, v in job.env.items():
-            run_args.append(f"--env={k}={v}")
-        for v in job.volumes:
-            run_args.append(f"--volume={v}")
-        for t in job.tags:
-            run_args.append(f"--tag={t}")
+        run_args.extend([f"--env={k}={v}" for k, v in job.env.items()])
+        run_args.extend([f"--volume={v}" for v in job.volumes])
+        run_args.extend([f"--tag={t}" for t in job.tags])
         if job.life_span is not None:
             run_args.append(f"--life-span={int(job.life_span)}s")
         if job.browse:
             run_args.append(f"--browse")
         if job.detach:
             run_args.append(f"--detach")
-        for pf in job.port_forward:
-            run_args.append(f"--port-forward={pf}")
+        run_args.extend([f"--port-forward={pf}" for pf in job.port_forward])
         if job.pass_config:
             run_args.append(f"--pass-config")
         project_role = self._flow.project.role
@@ -452,16 +498,19 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             )
             return
 
-        live_job_metas = []
-        for job_id in self.flow.job_ids:
-            job_meta = await self.flow.get_meta(job_id)
-            live_job_metas.append(job_meta)
-        for job_meta in live_job_metas:
-            await self.storage.replace_live_job(
-                multi=job_meta.multi,
-                yaml_id=job_meta.id,
-                tags=job_meta.tags,
+        live_job_metas = await asyncio.gather(
+            *(self._get_meta(job_id) for job_id in self.flow.job_ids)
+        )
+        await asyncio.gather(
+            *(
+                self.storage.replace_live_job(
+                    multi=job_meta.multi,
+                    yaml_id=job_meta.id,
+                    tags=job_meta.tags,
+                )
+                for job_meta in live_job_metas
             )
+        )
         await self._run_neuro_cli(*run_args)
 
     async def logs(self, job_id: str, suffix: Optional[str]) -> None:
@@ -474,6 +523,17 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             self._console.print(f"Job {fmt_id(job_id)} is not running")
             sys.exit(1)
 
+    async def _wait_terminated(
+        self, raw_id: str, *, delay: float = 0.2, max_delay: float = 3.0
+    ) -> None:
+        # Killed jobs can take a while to stop,
+        # poll the status with exponential backoff.
+        descr = await self.client.jobs.status(raw_id)
+        while descr.status not in TERMINATED_JOB_STATUSES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+            descr = await self.client.jobs.status(raw_id)
+
     async def kill_job(self, job_id: str, suffix: Optional[str]) -> bool:
         """Kill named job"""
         meta_ctx = await self._ensure_meta(job_id, suffix)
@@ -482,10 +542,7 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             async for descr in self._resolve_jobs(meta_ctx, suffix):
                 if descr.status in RUNNING_JOB_STATUSES:
                     await self.client.jobs.kill(descr.id)
-                    descr = await self.client.jobs.status(descr.id)
-                    while descr.status not in TERMINATED_JOB_STATUSES:
-                        await asyncio.sleep(0.2)
-                        descr = await self.client.jobs.status(descr.id)
+                    await self._wait_terminated(descr.id)
                     return True
         except ResourceNotFound:
             pass
@@ -501,24 +558,20 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
     async def kill_all(self) -> None:
         """Kill all jobs"""
         tasks = []
-        loop = asyncio.get_event_loop()
+        # neuro_sdk has no bulk kill, limit the number of jobs
+        # that are killed and polled at the same time instead.
+        sem = asyncio.Semaphore(self.KILL_ALL_CONCURRENCY)
 
         async def kill(descr: JobDescription) -> str:
-            tag_dct = {}
-            for tag in descr.tags:
-                key, sep, val = tag.partition(":")
-                if sep:
-                    tag_dct[key] = val
+            tag_dct = tags2dict(descr.tags)
             job_id = tag_dct["job"]
             suffix = tag_dct.get("multi")
-            await self.client.jobs.kill(descr.id)
-            try:
-                descr = await self.client.jobs.status(descr.id)
-                while descr.status not in TERMINATED_JOB_STATUSES:
-                    await asyncio.sleep(0.2)
-                    descr = await self.client.jobs.status(descr.id)
-            except ResourceNotFound:
-                pass
+            async with sem:
+                await self.client.jobs.kill(descr.id)
+                try:
+                    await self._wait_terminated(descr.id)
+                except ResourceNotFound:
+                    pass
             if suffix:
                 return f"{job_id} {suffix}"
             else:
@@ -527,7 +580,7 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         async for descr in self.client.jobs.list(
             tags=self.flow.tags, statuses=RUNNING_JOB_STATUSES
         ):
-            tasks.append(loop.create_task(kill(descr)))
+            tasks.append(asyncio.create_task(kill(descr)))
 
         for job_info in await asyncio.gather(*tasks):
             self._console.print(f"Killed job [b]{job_info}[/b]")
@@ -538,8 +591,7 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         volume_ctx = self.flow.volumes.get(volume)
         if volume_ctx is None:
             self._console.print(f"[red]Unknown volume [b]{volume}[/b]")
-            volumes = sorted(volume for volume in self.flow.volumes.keys())
-            volumes_str = ",".join(volumes)
+            volumes_str = ",".join(sorted(self.flow.volumes))
             self._console.print(f"[dim]Existing volumes: {volumes_str}")
             sys.exit(1)
         if volume_ctx.local is None:
@@ -548,11 +600,13 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         return volume_ctx
 
     async def upload(self, volume: str) -> None:
+        uri = await self._upload_files(volume)
+        await self._add_resource(uri)
+
+    async def _upload_files(self, volume: str) -> URL:
         volume_ctx = await self.find_volume(volume)
-        await self._run_neuro_cli(
-            "mkdir",
-            "--parents",
-            str(volume_ctx.remote.parent),
+        await self._client.storage.mkdir(
+            volume_ctx.remote.parent, parents=True, exist_ok=True
         )
         await self._run_neuro_cli(
             "cp",
@@ -562,11 +616,10 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             str(volume_ctx.full_local_path),
             str(volume_ctx.remote),
         )
-        uri = self._client.parse.normalize_uri(
+        return self._client.parse.normalize_uri(
             volume_ctx.remote,
             allowed_schemes=("storage",),
         )
-        await self._add_resource(uri)
 
     async def download(self, volume: str) -> None:
         volume_ctx = await self.find_volume(volume)
@@ -584,9 +637,14 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         await self._run_neuro_cli("rm", "--recursive", str(volume_ctx.remote))
 
     async def upload_all(self) -> None:
+        # Copies run one by one: neuro cp parallelizes transfers itself
+        # and draws its progress on the terminal.
+        # Only sharing the uploaded folders is done concurrently.
+        uris: List[URL] = []
         for volume in self.flow.volumes.values():
             if volume.local is not None:
-                await self.upload(volume.id)
+                uris.append(await self._upload_files(volume.id))
+        await asyncio.gather(*(self._add_resource(uri) for uri in uris))
 
     async def download_all(self) -> None:
         for volume in self.flow.volumes.values():
@@ -598,21 +656,20 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
             if volume.local is not None:
                 await self.clean(volume.id)
 
+    async def mkvolume(self, volume: str) -> None:
+        volume_ctx = await self.find_volume(volume)
+        self._console.print(f"Create volume [b]{volume}[/b]")
+        await self._client.storage.mkdir(volume_ctx.remote, parents=True, exist_ok=True)
+        uri = self._client.parse.normalize_uri(
+            volume_ctx.remote,
+            allowed_schemes=("storage",),
+        )
+        await self._add_resource(uri)
+
     async def mkvolumes(self) -> None:
         for volume in self.flow.volumes.values():
             if volume.local is not None:
-                volume_ctx = await self.find_volume(volume.id)
-                self._console.print(f"Create volume [b]{volume.id}[/b]")
-                await self._run_neuro_cli(
-                    "mkdir",
-                    "--parents",
-                    str(volume_ctx.remote),
-                )
-                uri = self._client.parse.normalize_uri(
-                    volume_ctx.remote,
-                    allowed_schemes=("storage",),
-                )
-                await self._add_resource(uri)
+                await self.mkvolume(volume.id)
 
     # images subsystem
 
@@ -620,8 +677,7 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
         image_ctx = self.flow.images.get(image)
         if image_ctx is None:
             self._console.print(f"[red]Unknown image [b]{image}[/b]")
-            images = sorted(image for image in self.flow.images.keys())
-            images_str = ",".join(images)
+            images_str = ",".join(sorted(self.flow.images))
             self._console.print(f"[dim]Existing images: {images_str}")
             sys.exit(1)
         if image_ctx.context is None:
@@ -663,17 +719,20 @@ class LiveRunner(AsyncContextManager["LiveRunner"]):
     async def _create_project_role(self, project_role: str) -> None:
         if self._is_projet_role_created:
             return
-        try:
-            await self._client.users.add(project_role)
-        except AuthorizationError:
-            pass
-            # We have no permissions to create role --
-            # assume that this is shared project and
-            # current user is not the owner
-        except IllegalArgumentError as e:
-            if "already exists" not in str(e):
-                raise
-        self._is_projet_role_created = True
+        async with self._project_role_lock:
+            if self._is_projet_role_created:
+                return
+            try:
+                await self._client.users.add(project_role)
+            except AuthorizationError:
+                pass
+                # We have no permissions to create role --
+                # assume that this is shared project and
+                # current user is not the owner
+            except IllegalArgumentError as e:
+                if "already exists" not in str(e):
+                    raise
+            self._is_projet_role_created = True
 
     async def _add_storage_resource(self, uri: URL) -> None:
         uri = self._client.parse.normalize_uri(
@@ -11,8 +11,12 @@ import abc
 import enum
 import logging
 import yaml
+from collections import OrderedDict
+from functools import lru_cache
 from typing import (
+    TYPE_CHECKING,
     Any,
+    BinaryIO,
     Callable,
     Dict,
     Generic,
@@ -21,6 +25,7 @@ from typing import (
     Optional,
     Sequence,
     TextIO,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -79,6 +84,24 @@ log = logging.getLogger(__name__)
 _T = TypeVar("_T", bound=TypeT)
 _Container = TypeVar("_Container")
 
+# The YAML reader detects the encoding of a binary stream itself
+YamlStream = Union[TextIO, BinaryIO]
+
+
+if TYPE_CHECKING or not yaml.__with_libyaml__:
+
+    class _YamlParser(Reader, Scanner, Parser, Composer):
+        def __init__(self, stream: YamlStream) -> None:
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+            Composer.__init__(self)
+
+else:
+    # libyaml does reading, scanning, parsing and composing in C,
+    # the pure Python implementation above is used as a fallback only.
+    from yaml.cyaml import CParser as _YamlParser
+
 
 @dataclasses.dataclass
 class ConfigDir:
@@ -92,9 +115,17 @@ class ConfigPath:
     config_file: LocalPath
 
 
+_STR_TAG = "tag:yaml.org,2002:str"
+
+
 class BaseConstructor(SafeConstructor):
     def construct_id(self, node: yaml.Node) -> str:
-        val = self.construct_object(node)  # type: ignore[no-untyped-call]
+        if isinstance(node, yaml.ScalarNode) and node.tag == _STR_TAG:
+            # Plain string keys are the common case,
+            # skip the generic tag dispatch of construct_object()
+            val = node.value
+        else:
+            val = self.construct_object(node)  # type: ignore[no-untyped-call]
         if not isinstance(val, str):
             raise ConstructorError(
                 None, None, f"expected a str, found {type(val)}", node.start_mark
@@ -114,8 +145,15 @@ class BaseConstructor(SafeConstructor):
         return val
 
 
+@lru_cache(maxsize=128)
+def _mark_filename(name: str) -> LocalPath:
+    # Every node of a document has the same file name,
+    # build the path once instead of once per position.
+    return LocalPath(name)
+
+
 def mark2pos(mark: yaml.Mark) -> Pos:
-    return Pos(mark.line, mark.column, LocalPath(mark.name))
+    return Pos(mark.line, mark.column, _mark_filename(mark.name))
 
 
 class SimpleCompound(Generic[_T, _Container], abc.ABC):
@@ -217,6 +255,7 @@ class ExprOrSeq(SimpleCompound[_T, BaseExpr[SequenceT]]):
     ) -> None:
         super().__init__(item_expr_factory)
         self._item_factory = item_value_factory
+        self._seq = SimpleSeq(item_expr_factory)
 
     def construct(self, ctor: BaseConstructor, node: yaml.Node) -> BaseExpr[SequenceT]:
         if isinstance(node, yaml.ScalarNode):
@@ -228,8 +267,7 @@ class ExprOrSeq(SimpleCompound[_T, BaseExpr[SequenceT]]):
                 self._item_factory,
             )
         else:
-            seq = SimpleSeq(self._factory).construct(ctor, node)
-            return SequenceItemsExpr(seq)
+            return SequenceItemsExpr(self._seq.construct(ctor, node))
 
 
 class ExprOrMapping(SimpleCompound[_T, BaseExpr[MappingT]]):
@@ -240,6 +278,7 @@ class ExprOrMapping(SimpleCompound[_T, BaseExpr[MappingT]]):
     ) -> None:
         super().__init__(item_expr_factory)
         self._item_factory = item_value_factory
+        self._mapping = SimpleMapping(item_expr_factory)
 
     def construct(self, ctor: BaseConstructor, node: yaml.Node) -> BaseExpr[MappingT]:
         if isinstance(node, yaml.ScalarNode):
@@ -251,8 +290,7 @@ class ExprOrMapping(SimpleCompound[_T, BaseExpr[MappingT]]):
                 self._item_factory,
             )
         else:
-            seq = SimpleMapping(self._factory).construct(ctor, node)
-            return MappingItemsExpr(seq)
+            return MappingItemsExpr(self._mapping.construct(ctor, node))
 
 
 def type2str(arg: TypeT) -> TypeT:
@@ -265,6 +303,9 @@ _AstType = TypeVar("_AstType", bound=ast.Base)
 _CtorType = TypeVar("_CtorType", bound=BaseConstructor)
 
 
+_UNKNOWN_KEY = object()
+
+
 def parse_dict(
     ctor: _CtorType,
     node: yaml.MappingNode,
@@ -301,14 +342,14 @@ def parse_dict(
     data = dict(extra)
     for k, v in node.value:
         key = ctor.construct_object(k)  # type: ignore[no-untyped-call]
-        if key not in keys:
+        item_ctor: Any = keys.get(key, _UNKNOWN_KEY)
+        if item_ctor is _UNKNOWN_KEY:
             raise ConstructorError(
                 f"while constructing a '{ret_name}'",
                 node.start_mark,
                 f"unexpected key '{key}'",
                 k.start_mark,
             )
-        item_ctor: Any = keys[key]
         tmp: Any
         value: Any
         if item_ctor is None:
@@ -336,59 +377,67 @@ def parse_dict(
             )
         data[key] = value
 
+    # data is local to this call, hooks get it without a defensive copy
     if preprocess is not None:
-        data = preprocess(ctor, node, dict(data))
+        data = preprocess(ctor, node, data)
     if find_res_type is not None:
-        res_type = find_res_type(ctor, node, res_type, dict(data))
+        res_type = find_res_type(ctor, node, res_type, data)
         ret_name = res_type.__name__
 
     optional_fields: Dict[str, Any] = {}
+    # Missing fields of the node share its position, an expression
+    # wrapping None is immutable and can be reused for all of them.
+    none_exprs: Dict[Type[Expr[Any]], Expr[Any]] = {}
     found_fields = data.keys() | {"_start", "_end"}
     field_names = set()
     for f in dataclasses.fields(res_type):
-        field_names.add(f.name)
-        if f.name == "_specified_fields":
-            optional_fields[f.name] = set(data.keys())
-        elif f.name not in found_fields:
-            key = f.name
-            item_ctor = keys[key]
+        name = f.name
+        field_names.add(name)
+        if name == "_specified_fields":
+            optional_fields[name] = set(data.keys())
+        elif name not in found_fields:
+            item_ctor = keys[name]
             if f.default is not dataclasses.MISSING:
-                optional_fields[f.name] = f.default
+                optional_fields[name] = f.default
             elif (
                 item_ctor is None
                 or isinstance(item_ctor, SimpleCompound)
                 or isinstance(item_ctor, ast.Base)
             ):
                 if f.metadata.get("allow_none", False):
-                    optional_fields[f.name] = None
+                    optional_fields[name] = None
                 else:
                     raise ConstructorError(
                         f"while constructing a '{ret_name}', "
-                        f"missing mandatory key '{f.name}'",
+                        f"missing mandatory key '{name}'",
                         node.start_mark,
                     )
             elif isinstance(item_ctor, type) and issubclass(item_ctor, Expr):
                 default_expr = f.metadata.get("default_expr", None)
                 if default_expr:
                     fake_node = dataclasses.replace(node_start, line=0, col=0)
-                    optional_fields[f.name] = item_ctor(
+                    optional_fields[name] = item_ctor(
                         fake_node, fake_node, default_expr
                     )
                 elif not item_ctor.allow_none:
                     raise ConstructorError(
                         f"while constructing a '{ret_name}', "
-                        f"missing mandatory key '{f.name}'",
+                        f"missing mandatory key '{name}'",
                         node.start_mark,
                     )
                 else:
-                    optional_fields[f.name] = item_ctor(node_start, node_end, None)
+                    none_expr = none_exprs.get(item_ctor)
+                    if none_expr is None:
+                        none_expr = item_ctor(node_start, node_end, None)
+                        none_exprs[item_ctor] = none_expr
+                    optional_fields[name] = none_expr
             elif isinstance(item_ctor, type) and issubclass(item_ctor, enum.Enum):
                 if f.metadata.get("allow_none", False):
-                    optional_fields[f.name] = None
+                    optional_fields[name] = None
             else:
                 raise ConstructorError(
                     f"while constructing a '{ret_name}', "
-                    f"unexpected '{f.name}' constructor type '{item_ctor!r}'",
+                    f"unexpected '{name}' constructor type '{item_ctor!r}'",
                     node.start_mark,
                 )
 
@@ -434,29 +483,24 @@ def parse_cache(ctor: BaseConstructor, node: yaml.MappingNode) -> ast.Cache:
 # #### Flow parser ####
 
 
-class FlowLoader(Reader, Scanner, Parser, Composer, BaseConstructor, BaseResolver):
-    def __init__(self, stream: TextIO, *, kind: ast.FlowKind) -> None:
-        Reader.__init__(self, stream)
-        Scanner.__init__(self)
-        Parser.__init__(self)
-        Composer.__init__(self)
+class FlowLoader(_YamlParser, BaseConstructor, BaseResolver):
+    def __init__(self, stream: YamlStream, *, kind: ast.FlowKind) -> None:
+        _YamlParser.__init__(self, stream)
         BaseConstructor.__init__(self)
         BaseResolver.__init__(self)
         self._kind = kind
 
 
+VOLUME = {
+    "remote": URIExpr,
+    "mount": RemotePathExpr,
+    "read_only": OptBoolExpr,
+    "local": OptLocalPathExpr,
+}
+
+
 def parse_volume(ctor: BaseConstructor, node: yaml.MappingNode) -> ast.Volume:
-    return parse_dict(
-        ctor,
-        node,
-        {
-            "remote": URIExpr,
-            "mount": RemotePathExpr,
-            "read_only": OptBoolExpr,
-            "local": OptLocalPathExpr,
-        },
-        ast.Volume,
-    )
+    return parse_dict(ctor, node, VOLUME, ast.Volume)
 
 
 def parse_volumes(
@@ -474,22 +518,20 @@ FlowLoader.add_path_resolver("flow:volumes", [(dict, "volumes")])  # type: ignor
 FlowLoader.add_constructor("flow:volumes", parse_volumes)  # type: ignore
 
 
+IMAGE = {
+    "ref": StrExpr,
+    "context": OptStrExpr,
+    "dockerfile": OptStrExpr,
+    "build_args": ExprOrSeq(StrExpr, type2str),
+    "env": ExprOrMapping(StrExpr, type2str),
+    "volumes": ExprOrSeq(OptStrExpr, type2str),
+    "build_preset": OptStrExpr,
+    "force_rebuild": OptBoolExpr,
+}
+
+
 def parse_image(ctor: BaseConstructor, node: yaml.MappingNode) -> ast.Image:
-    return parse_dict(
-        ctor,
-        node,
-        {
-            "ref": StrExpr,
-            "context": OptStrExpr,
-            "dockerfile": OptStrExpr,
-            "build_args": ExprOrSeq(StrExpr, type2str),
-            "env": ExprOrMapping(StrExpr, type2str),
-            "volumes": ExprOrSeq(OptStrExpr, type2str),
-            "build_preset": OptStrExpr,
-            "force_rebuild": OptBoolExpr,
-        },
-        ast.Image,
-    )
+    return parse_dict(ctor, node, IMAGE, ast.Image)
 
 
 def parse_images(ctor: BaseConstructor, node: yaml.MappingNode) -> Dict[str, ast.Image]:
@@ -897,40 +939,30 @@ FlowLoader.add_path_resolver("flow:tasks", [(dict, "tasks")])  # type: ignore
 FlowLoader.add_constructor("flow:tasks", FlowLoader.construct_sequence)  # type: ignore
 
 
+FLOW_DEFAULTS: Dict[str, Any] = {
+    "tags": ExprOrSeq(StrExpr, type2str),
+    "env": ExprOrMapping(StrExpr, type2str),
+    "volumes": ExprOrSeq(OptStrExpr, type2str),
+    "workdir": OptRemotePathExpr,
+    "life_span": OptTimeDeltaExpr,
+    "preset": OptStrExpr,
+    "schedule_timeout": OptTimeDeltaExpr,
+}
+
+
+BATCH_FLOW_DEFAULTS: Dict[str, Any] = {
+    **FLOW_DEFAULTS,
+    "fail_fast": OptBoolExpr,
+    "max_parallel": OptIntExpr,
+    "cache": None,
+}
+
+
 def parse_flow_defaults(ctor: FlowLoader, node: yaml.MappingNode) -> ast.FlowDefaults:
     if ctor._kind == ast.FlowKind.LIVE:
-        return parse_dict(
-            ctor,
-            node,
-            {
-                "tags": ExprOrSeq(StrExpr, type2str),
-                "env": ExprOrMapping(StrExpr, type2str),
-                "volumes": ExprOrSeq(OptStrExpr, type2str),
-                "workdir": OptRemotePathExpr,
-                "life_span": OptTimeDeltaExpr,
-                "preset": OptStrExpr,
-                "schedule_timeout": OptTimeDeltaExpr,
-            },
-            ast.FlowDefaults,
-        )
+        return parse_dict(ctor, node, FLOW_DEFAULTS, ast.FlowDefaults)
     elif ctor._kind == ast.FlowKind.BATCH:
-        return parse_dict(
-            ctor,
-            node,
-            {
-                "tags": ExprOrSeq(StrExpr, type2str),
-                "env": ExprOrMapping(StrExpr, type2str),
-                "volumes": ExprOrSeq(OptStrExpr, type2str),
-                "workdir": OptRemotePathExpr,
-                "life_span": OptTimeDeltaExpr,
-                "preset": OptStrExpr,
-                "schedule_timeout": OptTimeDeltaExpr,
-                "fail_fast": OptBoolExpr,
-                "max_parallel": OptIntExpr,
-                "cache": None,
-            },
-            ast.BatchFlowDefaults,
-        )
+        return parse_dict(ctor, node, BATCH_FLOW_DEFAULTS, ast.BatchFlowDefaults)
     else:
         raise ValueError(f"Unknown kind {ctor._kind}")
 
@@ -1016,7 +1048,17 @@ def find_flow_type(
         )
 
 
-def parse_flow_main(ctor: BaseConstructor, node: yaml.MappingNode) -> ast.BaseFlow:
+def parse_flow_main(ctor: FlowLoader, node: yaml.MappingNode) -> ast.BaseFlow:
+    # Check the kind before constructing the rest of the document,
+    # a flow of another kind has nothing to do with the loader's schema.
+    kind_node = _deep_get(node, ("kind",))
+    if isinstance(kind_node, yaml.ScalarNode) and kind_node.value != ctor._kind.value:
+        raise ConstructorError(
+            f"while constructing a '{ctor._kind.value}' flow",
+            node.start_mark,
+            f"unexpected kind '{kind_node.value}'",
+            kind_node.start_mark,
+        )
     ret = parse_dict(
         ctor,
         node,
@@ -1031,7 +1073,34 @@ FlowLoader.add_path_resolver("flow:main", [])  # type: ignore
 FlowLoader.add_constructor("flow:main", parse_flow_main)  # type: ignore
 
 
-def parse_live_stream(stream: TextIO) -> ast.LiveFlow:
+# Parsed ASTs are immutable, it is safe to share them between callers.
+# The cache key includes the file stat, an updated file is parsed again.
+_PARSE_CACHE_SIZE = 128
+_parse_cache: "OrderedDict[Tuple[str, str, int, int], Any]" = OrderedDict()
+
+
+def _parse_file_cached(
+    config_file: LocalPath, parse_stream: Callable[[YamlStream], _AstType]
+) -> _AstType:
+    st = config_file.stat()
+    key = (parse_stream.__name__, str(config_file), st.st_mtime_ns, st.st_size)
+    ret = _parse_cache.get(key)
+    if ret is not None:
+        _parse_cache.move_to_end(key)
+        return cast(_AstType, ret)
+    with config_file.open("rb") as f:
+        ret = parse_stream(f)
+    _parse_cache[key] = ret
+    if len(_parse_cache) > _PARSE_CACHE_SIZE:
+        _parse_cache.popitem(last=False)
+    return ret
+
+
+def clear_parse_cache() -> None:
+    _parse_cache.clear()
+
+
+def parse_live_stream(stream: YamlStream) -> ast.LiveFlow:
     loader = FlowLoader(stream, kind=ast.FlowKind.LIVE)
     try:
         ret = loader.get_single_data()
@@ -1044,11 +1113,10 @@ def parse_live_stream(stream: TextIO) -> ast.LiveFlow:
 
 def parse_live(workspace: LocalPath, config_file: LocalPath) -> ast.LiveFlow:
     # Parse live flow config file
-    with config_file.open() as f:
-        return parse_live_stream(f)
+    return _parse_file_cached(config_file, parse_live_stream)
 
 
-def parse_batch_stream(stream: TextIO) -> ast.BatchFlow:
+def parse_batch_stream(stream: YamlStream) -> ast.BatchFlow:
     loader = FlowLoader(stream, kind=ast.FlowKind.BATCH)
     try:
         ret = loader.get_single_data()
@@ -1061,8 +1129,7 @@ def parse_batch_stream(stream: TextIO) -> ast.BatchFlow:
 
 def parse_batch(workspace: LocalPath, config_file: LocalPath) -> ast.BatchFlow:
     # Parse pipeline flow config file
-    with config_file.open() as f:
-        return parse_batch_stream(f)
+    return _parse_file_cached(config_file, parse_batch_stream)
 
 
 def find_workspace(path: Optional[Union[LocalPath, str]]) -> ConfigDir:
@@ -1099,12 +1166,9 @@ def find_workspace(path: Optional[Union[LocalPath, str]]) -> ConfigDir:
 # #### Action parser ####
 
 
-class ActionLoader(Reader, Scanner, Parser, Composer, BaseConstructor, BaseResolver):
-    def __init__(self, stream: TextIO) -> None:
-        Reader.__init__(self, stream)
-        Scanner.__init__(self)
-        Parser.__init__(self)
-        Composer.__init__(self)
+class ActionLoader(_YamlParser, BaseConstructor, BaseResolver):
+    def __init__(self, stream: YamlStream) -> None:
+        _YamlParser.__init__(self, stream)
         BaseConstructor.__init__(self)
         BaseResolver.__init__(self)
 
@@ -1429,12 +1493,9 @@ ActionLoader.add_constructor("action:main", parse_action_main)  # type: ignore
 # #### Action parser ####
 
 
-class BakeMetaLoader(Reader, Scanner, Parser, Composer, BaseConstructor, BaseResolver):
-    def __init__(self, stream: TextIO) -> None:
-        Reader.__init__(self, stream)
-        Scanner.__init__(self)
-        Parser.__init__(self)
-        Composer.__init__(self)
+class BakeMetaLoader(_YamlParser, BaseConstructor, BaseResolver):
+    def __init__(self, stream: YamlStream) -> None:
+        _YamlParser.__init__(self, stream)
         BaseConstructor.__init__(self)
         BaseResolver.__init__(self)
 
@@ -1459,7 +1520,7 @@ BakeMetaLoader.add_path_resolver("bake_meta:main", [])  # type: ignore
 BakeMetaLoader.add_constructor("bake_meta:main", parse_meta_main)  # type: ignore
 
 
-def parse_action_stream(stream: TextIO) -> ast.BaseAction:
+def parse_action_stream(stream: YamlStream) -> ast.BaseAction:
     ret: ast.Project
     loader = ActionLoader(stream)
     try:
@@ -1472,12 +1533,11 @@ def parse_action_stream(stream: TextIO) -> ast.BaseAction:
 
 def parse_action(action_file: LocalPath) -> ast.BaseAction:
     # Parse project config file
-    with action_file.open() as f:
-        return parse_action_stream(f)
+    return _parse_file_cached(action_file, parse_action_stream)
 
 
 def parse_bake_meta(meta_file: LocalPath) -> Mapping[str, str]:
-    with meta_file.open() as f:
+    with meta_file.open("rb") as f:
         result = BakeMetaLoader(f).get_single_data()
         assert isinstance(result, dict)
         return result
@@ -1486,12 +1546,9 @@ def parse_bake_meta(meta_file: LocalPath) -> Mapping[str, str]:
 # #### Project parser ####
 
 
-class ProjectLoader(Reader, Scanner, Parser, Composer, BaseConstructor, BaseResolver):
-    def __init__(self, stream: TextIO) -> None:
-        Reader.__init__(self, stream)
-        Scanner.__init__(self)
-        Parser.__init__(self)
-        Composer.__init__(self)
+class ProjectLoader(_YamlParser, BaseConstructor, BaseResolver):
+    def __init__(self, stream: YamlStream) -> None:
+        _YamlParser.__init__(self, stream)
         BaseConstructor.__init__(self)
         BaseResolver.__init__(self)
 
@@ -1581,7 +1638,7 @@ ProjectLoader.add_path_resolver("project:mixins", [(dict, "mixins")])  # type: i
 ProjectLoader.add_constructor("project:mixins", parse_project_mixins)  # type: ignore
 
 
-def parse_project_stream(stream: TextIO) -> ast.Project:
+def parse_project_stream(stream: YamlStream) -> ast.Project:
     ret: ast.Project
     loader = ProjectLoader(stream)
     try:
@@ -1,5 +1,6 @@
 import pathlib
 import pytest
+import yaml
 from yaml.constructor import ConstructorError
 
 from neuro_flow import ast
@@ -24,7 +25,7 @@ from neuro_flow.expr import (
     StrExpr,
     URIExpr,
 )
-from neuro_flow.parser import parse_batch
+from neuro_flow.parser import FlowLoader, _YamlParser, parse_batch
 from neuro_flow.tokenizer import Pos
 
 
@@ -1551,3 +1552,10 @@ def test_batch_action_call_extra_attrs(assets: pathlib.Path) -> None:
     config_file = workspace / "batch-action-call-extra-attrs.yml"
     with pytest.raises(ConstructorError):
         parse_batch(workspace, config_file)
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML is built without libyaml")
+def test_flow_loader_uses_libyaml() -> None:
+    # libyaml loaders are built on the same C parser
+    assert _YamlParser in yaml.CBaseLoader.__mro__
+    assert issubclass(FlowLoader, _YamlParser)
@@ -3,7 +3,15 @@ import pytest
 import textwrap
 from contextlib import asynccontextmanager
 from neuro_sdk import Client
-from typing import AsyncContextManager, AsyncIterator, Callable, Mapping
+from typing import (
+    AbstractSet,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Mapping,
+    Set,
+    Tuple,
+)
 
 from neuro_flow.batch_runner import (
     ImageRefNotUniqueError,
@@ -21,11 +29,62 @@ from neuro_flow.expr import MultiError
 from neuro_flow.parser import ConfigDir
 from neuro_flow.storage.base import BakeImage, BakeMeta, Storage
 from neuro_flow.storage.in_memory import InMemoryStorage
+from neuro_flow.types import FullID
 
 
 BatchClFactory = Callable[[str], AsyncContextManager[ConfigLoader]]
 
 
+Graphs = Mapping[FullID, Mapping[FullID, AbstractSet[FullID]]]
+
+# Sets compare equal to frozensets, build_graphs() results
+# are compared with these constants directly.
+ACTION_CALL_GRAPHS: Graphs = {
+    (): {("test",): frozenset()},
+    ("test",): {
+        ("test", "task_1"): frozenset(),
+        ("test", "task_2"): frozenset({("test", "task_1")}),
+    },
+}
+
+EARLY_GRAPHS: Graphs = {
+    (): {
+        ("first_ac",): frozenset(),
+        ("second",): frozenset({("first_ac",)}),
+        ("third",): frozenset({("first_ac",)}),
+    },
+    ("first_ac",): {("first_ac", "task_2"): frozenset()},
+    ("second",): {
+        ("second", "task-1-o3-t3"): frozenset(),
+        ("second", "task-1-o1-t1"): frozenset(),
+        ("second", "task-1-o2-t1"): frozenset(),
+        ("second", "task-1-o2-t2"): frozenset(),
+        ("second", "task_2"): frozenset(
+            {
+                ("second", "task-1-o3-t3"),
+                ("second", "task-1-o1-t1"),
+                ("second", "task-1-o2-t1"),
+                ("second", "task-1-o2-t2"),
+            }
+        ),
+    },
+    ("third",): {
+        ("third", "task-1-o3-t3"): frozenset(),
+        ("third", "task-1-o1-t1"): frozenset(),
+        ("third", "task-1-o2-t1"): frozenset(),
+        ("third", "task-1-o2-t2"): frozenset(),
+        ("third", "task_2"): frozenset(
+            {
+                ("third", "task-1-o3-t3"),
+                ("third", "task-1-o1-t1"),
+                ("third", "task-1-o2-t1"),
+                ("third", "task-1-o2-t2"),
+            }
+        ),
+    },
+}
+
+
 @pytest.fixture
 async def batch_cl_factory(
     loop: None,
@@ -67,9 +126,9 @@ async def test_iter_flows(batch_cl_factory: BatchClFactory) -> None:
 
 async def test_check_no_cycles(batch_cl_factory: BatchClFactory) -> None:
     async with batch_cl_factory("") as cl:
-        flow = await RunningBatchFlow.create(cl, "batch-cycle", "bake-id")
-        with pytest.raises(CycleError):
-            await check_no_cycles(flow)
+        flow = await RunningBatchFlow.create(cl, "batch-action-call", "bake-id")
+        # Should not raise an exception
+        await check_no_cycles(flow)
 
 
 async def test_check_cycles(batch_cl_factory: BatchClFactory) -> None:
@@ -103,51 +162,14 @@ async def test_graphs(batch_cl_factory: BatchClFactory) -> None:
     async with batch_cl_factory("") as cl:
         flow = await RunningBatchFlow.create(cl, "batch-action-call", "bake-id")
         graphs = await build_graphs(flow)
-        assert graphs == {
-            (): {("test",): set()},
-            ("test",): {
-                ("test", "task_1"): set(),
-                ("test", "task_2"): {("test", "task_1")},
-            },
-        }
+        assert graphs == ACTION_CALL_GRAPHS
 
 
 async def test_early_graph(batch_cl_factory: BatchClFactory) -> None:
     async with batch_cl_factory("early_graph") as cl:
         flow = await RunningBatchFlow.create(cl, "batch", "bake-id")
         graphs = await build_graphs(flow)
-        assert graphs == {
-            (): {
-                ("first_ac",): set(),
-                ("second",): {("first_ac",)},
-                ("third",): {("first_ac",)},
-            },
-            ("first_ac",): {("first_ac", "task_2"): set()},
-            ("second",): {
-                ("second", "task-1-o3-t3"): set(),
-                ("second", "task-1-o1-t1"): set(),
-                ("second", "task-1-o2-t1"): set(),
-                ("second", "task-1-o2-t2"): set(),
-                ("second", "task_2"): {
-                    ("second", "task-1-o3-t3"),
-                    ("second", "task-1-o1-t1"),
-                    ("second", "task-1-o2-t1"),
-                    ("second", "task-1-o2-t2"),
-                },
-            },
-            ("third",): {
-                ("third", "task-1-o3-t3"): set(),
-                ("third", "task-1-o1-t1"): set(),
-                ("third", "task-1-o2-t1"): set(),
-                ("third", "task-1-o2-t2"): set(),
-                ("third", "task_2"): {
-                    ("third", "task-1-o3-t3"),
-                    ("third", "task-1-o1-t1"),
-                    ("third", "task-1-o2-t1"),
-                    ("third", "task-1-o2-t2"),
-                },
-            },
-        }
+        assert graphs == EARLY_GRAPHS
 
 
 async def test_check_image_refs_unique(batch_cl_factory: BatchClFactory) -> None:
@@ -203,10 +225,10 @@ async def test_upload_image_data(
         )
         bake_storage = project_storage.bake(id=bake.id)
 
-        runs = []
+        runs: Set[Tuple[str, ...]] = set()
 
         async def _fake_run_cli(*args: str) -> None:
-            runs.append(args)
+            runs.add(args)
 
         await upload_image_data(flow, _fake_run_cli, bake_storage)
 
@@ -224,21 +246,14 @@ async def test_upload_image_data(
             img = ref2img[ref]
             assert img.context_on_storage
             assert img.dockerfile_rel == "Dockerfile"
-            assert any(
-                run == ("mkdir", "--parents", str(img.context_on_storage))
-                for run in runs
-            )
-            assert any(
-                run
-                == (
-                    "cp",
-                    "--recursive",
-                    "--update",
-                    "--no-target-directory",
-                    str(assets / "batch_images/dir")
-                    if ref == "image:main"
-                    else str(assets / "batch_images/subdir"),
-                    str(img.context_on_storage),
-                )
-                for run in runs
-            )
+            assert ("mkdir", "--parents", str(img.context_on_storage)) in runs
+            assert (
+                "cp",
+                "--recursive",
+                "--update",
+                "--no-target-directory",
+                str(assets / "batch_images/dir")
+                if ref == "image:main"
+                else str(assets / "batch_images/subdir"),
+                str(img.context_on_storage),
+            ) in runs
@@ -146,6 +146,18 @@ def test_cycle(
         ColoredTopoSorter(graph)
 
 
+def test_diamond_deps_first() -> None:
+    # Dependent node comes first, so the shared dependency is reached twice
+    graph: Mapping[int, Mapping[int, str]] = {
+        4: {2: "a", 3: "a"},
+        2: {1: "a"},
+        3: {1: "a"},
+        1: {},
+    }
+    topo = ColoredTopoSorter(graph)
+    assert topo.get_ready() == {1}
+
+
 def test_all_colored() -> None:
     graph: Mapping[int, Mapping[int, str]] = {
         1: {},
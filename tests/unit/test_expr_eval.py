@@ -10,6 +10,7 @@ from neuro_flow.expr import (
     EvalError,
     FloatExpr,
     MappingExpr,
+    OptTimeDeltaExpr,
     RootABC,
     SequenceExpr,
     StrExpr,
@@ -163,6 +164,26 @@ def test_parse_empty_float() -> None:
         FloatExpr(START, START, "")
 
 
+@pytest.mark.parametrize(
+    "pat,seconds",
+    [
+        ("1d2h3m4s", 93784.0),
+        ("1d4s", 86404.0),
+        ("15m", 900.0),
+        ("90", 90.0),
+        ("1.5", 1.5),
+        ("1d\n", 86400.0),
+    ],
+)
+def test_parse_time_delta(pat: str, seconds: float) -> None:
+    assert OptTimeDeltaExpr(START, START, pat).value == seconds
+
+
+def test_parse_bad_time_delta() -> None:
+    with pytest.raises(EvalError, match="is not a time delta unit"):
+        OptTimeDeltaExpr(START, START, "1h1d")
+
+
 def test_parse_implicit_concatenation_of_float() -> None:
     with pytest.raises(EvalError):
         pat = "${{ 1 }}_${{ 2 }}"
@@ -16,6 +16,7 @@ from neuro_flow.expr import (
     ListMaker,
     Literal,
     Lookup,
+    StrExpr,
     Text,
     UnaryOp,
     logical_and,
@@ -219,6 +220,16 @@ def test_text_with_dot() -> None:
     )
 
 
+@pytest.mark.parametrize(
+    "text", ["some text", "multi\nline\n  text", "$ {{ not expr }}", "}} ]]"]
+)
+def test_plain_text_expr(text: str) -> None:
+    start = Pos(2, 4, FNAME)
+    expr = StrExpr(start, start, text)
+    assert expr._parsed == PARSER.parse(list(tokenize(text, start)))
+    assert expr.value == text
+
+
 def test_parser1() -> None:
     assert [
         Text(Pos(0, 0, FNAME), Pos(0, 5, FNAME), "some "),
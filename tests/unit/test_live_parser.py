@@ -28,7 +28,7 @@ from neuro_flow.expr import (
     URIExpr,
     port_pair_item,
 )
-from neuro_flow.parser import parse_live, type2str
+from neuro_flow.parser import clear_parse_cache, parse_live, type2str
 from neuro_flow.tokenizer import Pos
 
 
@@ -1181,3 +1181,27 @@ def test_live_action_call_extra_attrs(assets: pathlib.Path) -> None:
     config_file = workspace / "live-action-call-extra-attrs.yml"
     with pytest.raises(ConstructorError):
         parse_live(workspace, config_file)
+
+
+def test_live_parse_batch_kind(assets: pathlib.Path) -> None:
+    workspace = assets
+    config_file = workspace / "batch-minimal.yml"
+    with pytest.raises(ConstructorError, match="unexpected kind 'batch'"):
+        parse_live(workspace, config_file)
+
+
+def test_parse_cached(tmp_path: pathlib.Path, assets: pathlib.Path) -> None:
+    workspace = tmp_path
+    config_file = workspace / "live.yml"
+    config_file.write_text((assets / "live-minimal.yml").read_text())
+    clear_parse_cache()
+    flow = parse_live(workspace, config_file)
+    assert parse_live(workspace, config_file) is flow
+
+    config_file.write_text((assets / "live-full.yml").read_text())
+    flow2 = parse_live(workspace, config_file)
+    assert flow2 is not flow
+    assert flow2 != flow
+
+    clear_parse_cache()
+    assert parse_live(workspace, config_file) is not flow2